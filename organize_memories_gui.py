@@ -4,76 +4,197 @@ Organize Snapchat Memories (HTML export) — GUI met voortgang & annuleren
 - Leest 'memories.html' (met <img>/<video> die naar lokale bestanden wijzen)
 - Haalt datum uit HTML (div.text-line) of desnoods uit bestandsnaam/timestamp
 - Kopieert naar mappen: OUT/ YYYY / YYYY-MM / YYYY-MM-DD_<origineel>
-- Standaardbibliotheken: tkinter, html.parser, shutil, etc.
+- Standaardbibliotheken: tkinter, re, shutil, etc.
 """
 
-import re, shutil, threading, queue
+import multiprocessing, os, re, shutil, sys, threading, time, queue
+from collections import deque
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from pathlib import Path
-from html.parser import HTMLParser
-from datetime import datetime
+from html import unescape
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
-
-# ---------------- HTML parser ----------------
-class MemoriesHTML(HTMLParser):
+COPY_WORKERS = 8           # kopiëren is I/O-gebonden: meerdere tegelijk
+MAX_IN_FLIGHT = 64         # kopieën in de wachtrij; begrenst geheugen bij grote exports
+PUMP_BATCH = 256           # max. berichten per GUI-tick
+LOG_LINES = 2000           # het logvenster houdt alleen de laatste regels
+
+# ---------------- HTML scan ----------------
+# <img|video src="..."> (groep 1-3: src met dubbele/enkele/geen quotes) of
+# <div class="text-line">tekst</div> (groep 4: inhoud, mag inline tags bevatten)
+MEDIA_RE = re.compile(
+    r"""<(?:img|video)\b[^>]*?\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>][^\s>]*)(?=[\s>]))"""
+    r"""|<div\b[^>]*?\sclass\s*=\s*(?:"[^"]*text-line[^"]*"|'[^']*text-line[^']*'|[^\s"'>]*text-line[^\s>]*)"""
+    r"""[^>]*>((?:[^<]|<(?!/?div\b))*)</div>""",
+    re.I,
+)
+TAG_RE = re.compile(r"<[^>]*>")
+
+READ_CHUNK = 1 << 20       # HTML wordt in blokken van 1 MiB gelezen
+SCAN_TAIL = 4096           # bewaard tussen blokken, zodat een gesplitste tag toch gevonden wordt
+SCAN_BATCH = 1000          # items per bericht van het scanproces
+
+def read_chunks(f, size: int = READ_CHUNK):
+    while chunk := f.read(size):
+        yield chunk
+
+def iter_memories(chunks):
     """
-    Verzamelt paren (src, date_str). In veel exports staat <img|video src="...">
-    met in de buurt een <div class="text-line">YYYY-MM-DD</div>.
+    Levert paren (src, date_str) terwijl de HTML blok voor blok gescand wordt.
+    In veel exports staat <img|video src="..."> met erna een
+    <div class="text-line">YYYY-MM-DD</div>.
     """
-    def __init__(self):
-        super().__init__()
-        self.items = []            # list[{"src": str, "date": str|""}]
-        self._buf = ""             # lopende tekstbuffer (context)
-        self._in_textline = False
-        self._last_media_index = None
-
-    def handle_starttag(self, tag, attrs):
-        tag = tag.lower()
-        attrs = dict(attrs)
-        if tag in ("img", "video"):
-            src = attrs.get("src") or ""
-            if src:
-                self.items.append({"src": src, "date": ""})
-                self._last_media_index = len(self.items) - 1
-        elif tag == "div":
-            cls = attrs.get("class", "")
-            if isinstance(cls, str) and "text-line" in cls:
-                self._in_textline = True
-
-    def handle_endtag(self, tag):
-        if tag.lower() == "div":
-            self._in_textline = False
-
-    def handle_data(self, data):
-        if not data:
-            return
-        self._buf += data
-        if self._in_textline and self._last_media_index is not None:
-            m = DATE_RE.search(data)
-            if m:
-                self.items[self._last_media_index]["date"] = m.group(0)
+    src, date = None, ""
+    buf = ""
+    for chunk in chunks:
+        buf += chunk
+        end = 0
+        for m in MEDIA_RE.finditer(buf):
+            end = m.end()
+            if m.lastindex < 4:
+                if not m.group(m.lastindex):
+                    continue  # lege src
+                if src is not None:
+                    yield src, date
+                src, date = unescape(m.group(m.lastindex)), ""
+            elif src is not None and not date:
+                d = DATE_RE.search(TAG_RE.sub(" ", m.group(4)))
+                if d:
+                    date = d.group(0)
+        buf = buf[max(end, len(buf) - SCAN_TAIL):]
+    if src is not None:
+        yield src, date
 
 # ---------------- helpers ----------------
-def normalize_src(src: str) -> str:
-    s = src.strip()
-    if s.startswith(".//"):
-        s = s[3:]
-    elif s.startswith("./"):
-        s = s[2:]
-    s = s.split("?", 1)[0]  # strip query
-    return s
-
-def date_from_name(path: Path) -> str:
-    m = DATE_RE.search(path.name)
+def normalize_srcs(srcs) -> list:
+    # in één keer: spaties, "./" of ".//" vooraan en querystring eraf
+    return [
+        (s[3:] if s.startswith(".//") else s[2:] if s.startswith("./") else s).partition("?")[0]
+        for s in map(str.strip, srcs)
+    ]
+
+def date_from_name(name: str) -> str:
+    m = DATE_RE.search(name)
     return m.group(0) if m else ""
 
-def fallback_date_from_fs(path: Path) -> str:
-    dt = datetime.fromtimestamp(path.stat().st_mtime)
-    return dt.strftime("%Y-%m-%d")
+def dir_files(listings: dict, folder: str) -> dict:
+    """
+    De bestanden in `folder` als {normcase(naam): DirEntry}. Elke map wordt één keer
+    met os.scandir gelezen, zodra een src ernaar wijst, en bewaard in `listings`.
+    """
+    files = listings.get(folder)
+    if files is None:
+        try:
+            with os.scandir(folder) as it:
+                files = {os.path.normcase(e.name): e for e in it if e.is_file()}
+        except OSError:
+            files = {}             # map bestaat niet of is onleesbaar
+        listings[folder] = files
+    return files
+
+def _outside(rel: str) -> bool:
+    # absoluut (op Windows ook "\\x" of "C:...") of omhoog uit de exportmap
+    return (os.path.isabs(rel) or bool(os.path.splitdrive(rel)[0]) or rel.startswith(os.sep)
+            or rel == os.pardir or rel.startswith(os.pardir + os.sep))
+
+def _find_in(listings: dict, folder: str, name: str):
+    """Zoekt `name` op in de lijst van `folder`; geeft (pad, DirEntry), (pad, None) of (None, None)."""
+    entry = dir_files(listings, folder).get(os.path.normcase(name))
+    if entry is not None:
+        return entry.path, entry
+    # niet onder deze schrijfwijze gevonden; normcase negeert hoofdletters alleen op
+    # Windows, maar ook macOS doet dat standaard, dus het bestandssysteem één keer vragen
+    path = os.path.join(folder, name)
+    return (path, None) if os.path.isfile(path) else (None, None)
+
+def find_source(base_dir: str, listings: dict, rel: str):
+    """
+    Zoekt een genormaliseerde src op in base_dir. Geeft (pad, DirEntry),
+    (pad, None) buiten de exportmap of na een mis in de lijst, of (None, None)
+    als hij er niet is.
+    """
+    rel = os.path.normpath(rel)
+    if _outside(rel):
+        # alleen op schijf gecontroleerd: mappen buiten de export worden niet ingelezen
+        path = os.path.join(base_dir, rel)
+        if os.path.exists(path):
+            return path, None
+    else:
+        folder, name = os.path.split(rel)
+        path, entry = _find_in(listings, os.path.join(base_dir, folder) if folder else base_dir, name)
+        if path is not None:
+            return path, entry
+    # Als pad niet bestaat, probeer alleen de bestandsnaam
+    return _find_in(listings, base_dir, os.path.basename(rel))
+
+def fallback_date_from_fs(path: str, entry=None) -> str:
+    # mtime uit de (gecachete) stat van de DirEntry als die er is; zelf opmaken, strftime is traag
+    st = entry.stat() if entry is not None else os.stat(path)
+    t = time.localtime(st.st_mtime)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+    # use_last_error: de foutcode direct na de aanroep bewaren, voordat iets anders hem overschrijft
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CopyFileW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.BOOL)
+    _kernel32.CopyFileW.restype = wintypes.BOOL
+
+def _fast_copy(src: str, dst: str):
+    """
+    shutil.copy2, behalve op Windows: daar kopieert het OS via CopyFileW.
+    Overschrijft nooit: bestaat dst al (bv. een naam die alleen in hoofdletters
+    verschilt op een hoofdletterongevoelige schijf), dan volgt een fout.
+    """
+    if sys.platform == "win32":
+        if not _kernel32.CopyFileW(src, dst, True):  # fout als dst bestaat
+            raise ctypes.WinError(ctypes.get_last_error())
+        return  # CopyFileW neemt ook tijdstempels en attributen mee
+    # eerst de naam claimen; O_EXCL faalt als het bestandssysteem hem al kent
+    os.close(os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+    try:
+        # copy2 gebruikt zelf al sendfile op Linux en fcopyfile op macOS
+        shutil.copy2(src, dst)
+    except OSError:
+        with suppress(OSError):
+            os.remove(dst)
+        raise
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink van dst naar src (zelfde bestandssysteem: geen bytes kopiëren, geen extra ruimte); anders kopiëren."""
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        raise
+    except OSError:
+        # bv. geen hardlinks mogelijk, geen rechten, linklimiet bereikt
+        _fast_copy(src, dst)
 
 # ---------------- worker thread ----------------
+def _scan_process(html_path: str, conn):
+    """Kindproces: scant de HTML en stuurt ("items", [(src, date), ...]) in batches."""
+    try:
+        batch = []
+        with open(html_path, "r", encoding="utf-8", errors="ignore") as f:
+            for item in iter_memories(read_chunks(f)):
+                batch.append(item)
+                if len(batch) >= SCAN_BATCH:
+                    conn.send(("items", batch))
+                    batch = []
+        conn.send(("items", batch))
+        conn.send(("end", None))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+class ScanError(Exception):
+    """Fout gemeld door het scanproces."""
+
 class Worker(threading.Thread):
     def __init__(self, html_path: Path, out_dir: Path, ui_q: "queue.Queue", cancel_flag: threading.Event):
         super().__init__(daemon=True)
@@ -81,74 +202,183 @@ class Worker(threading.Thread):
         self.out_dir = out_dir
         self.ui_q = ui_q
         self.cancel = cancel_flag
+        self._dir_names = {}       # doelmap -> namen erin, casefold (bestaand + in de wachtrij)
+        # casefold op elk platform: normcase laat hoofdletters staan op macOS, maar APFS
+        # onderscheidt ze standaard niet; een extra _1 op een hoofdlettergevoelige schijf kost niets
+        # tellers, bijgewerkt zodra batches en kopieën binnenkomen
+        self.total = 0
+        self.done = 0
+        self.ok = 0
+        self.fail = 0
+        self.skipped = 0
+
+    def _start_scan(self):
+        """Start het scannen van de HTML in een kindproces; geeft een generator van batches."""
+        ctx = multiprocessing.get_context("spawn")
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_scan_process, args=(str(self.html_path), send_conn), daemon=True)
+        proc.start()
+        send_conn.close()
+        return self._recv_batches(proc, recv_conn)
+
+    @staticmethod
+    def _recv_batches(proc, conn):
+        try:
+            while True:
+                kind, payload = conn.recv()
+                if kind == "items":
+                    yield payload
+                elif kind == "error":
+                    raise ScanError(payload)
+                else:
+                    return
+        finally:
+            conn.close()
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+    def _resolve(self, batches, base_dir: str, out_dir: str, listings: dict):
+        """Maakt van gescande (src, date)-batches (src, doel)-taken; meldt missende en dubbele items."""
+        seen = {}                  # (bron, datum) -> src van de eerste verwijzing
+        for batch in batches:
+            self.total += len(batch)
+            self.ui_q.put(("meta", self.total))
+            rels = normalize_srcs([src for src, _ in batch])
+            for (raw_src, html_date), rel in zip(batch, rels):
+                if self.cancel.is_set():
+                    return
+
+                src_path, entry = find_source(base_dir, listings, rel)
+                if src_path is None:
+                    self.fail += 1
+                    self.done += 1
+                    self.ui_q.put(("progress", self.done, "missing", raw_src))
+                    continue
+
+                # datum bepalen
+                src_name = os.path.basename(src_path)
+                date_str = html_date or date_from_name(src_name) or fallback_date_from_fs(src_path, entry)
+                # exports verwijzen vaak meer dan eens naar hetzelfde bestand
+                key = (os.path.normcase(src_path), date_str)
+                if key in seen:
+                    self.skipped += 1
+                    self.done += 1
+                    self.ui_q.put(("progress", self.done, "duplicate", (seen[key], raw_src)))
+                    continue
+                seen[key] = raw_src
+
+                year = date_str[:4]
+                ym = date_str[:7]
+                tgt_dir = os.path.join(out_dir, year, ym)
+                names = self._dir_names.get(tgt_dir)
+                if names is None:
+                    os.makedirs(tgt_dir, exist_ok=True)
+                    names = {e.name.casefold() for e in os.scandir(tgt_dir)}
+                    self._dir_names[tgt_dir] = names
+
+                base_name = f"{date_str}_{src_name}"
+                name = base_name
+
+                stem, suffix = os.path.splitext(base_name)
+                sfx = 1
+                while name.casefold() in names:
+                    name = f"{stem}_{sfx}{suffix}"
+                    sfx += 1
+                names.add(name.casefold())
+                yield src_path, os.path.join(tgt_dir, name)
+
+    def _copy_all(self, tasks, copy=_fast_copy):
+        """
+        Kopieert (src, doel)-paren in de pool; levert (doel, fout of None) zodra ze klaar zijn.
+        Bij annuleren vervallen kopieën die nog niet liepen; die al liepen worden nog geleverd.
+        """
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            pending = {}
+            try:
+                for src, target in tasks:
+                    if len(pending) >= MAX_IN_FLIGHT:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            yield pending.pop(fut), fut.exception()
+                    if self.cancel.is_set():
+                        break  # geannuleerd: niets nieuws meer starten
+                    pending[pool.submit(copy, src, target)] = target
+                if self.cancel.is_set():
+                    # kopieën die nog niet liepen vervallen; de rest komt op schijf, dus tellen
+                    pending = {fut: target for fut, target in pending.items() if not fut.cancel()}
+                for fut in as_completed(pending):
+                    yield pending[fut], fut.exception()
+            finally:
+                # vroeg gesloten (fout): kopieën die nog niet liepen vervallen
+                for fut in pending:
+                    fut.cancel()
 
     def run(self):
-        # lees html
+        # html scannen in een kindproces (geen strijd om de GIL); het kopiëren
+        # begint zodra de eerste batch binnen is
         try:
-            txt = self.html_path.read_text(encoding="utf-8", errors="ignore")
+            batches = self._start_scan()
         except Exception as e:
             self.ui_q.put(("error", f"Kon HTML niet lezen:\n{e}"))
             return
 
-        parser = MemoriesHTML()
-        parser.feed(txt)
-        items = parser.items
-
-        if not items:
-            self.ui_q.put(("error", "Geen media-tags (img/video) gevonden in deze HTML."))
+        # in de lus hieronder gewone strings: Path-objecten kosten per item meerdere allocaties
+        base_dir = str(self.html_path.parent)
+        out_dir = str(self.out_dir)
+        # mappen van de export, elk één keer ingelezen zodra nodig, i.p.v. exists() per item
+        listings = {}
+        # zelfde bestandssysteem: hardlinken i.p.v. de bytes kopiëren
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            same_dev = os.stat(base_dir).st_dev == os.stat(out_dir).st_dev
+        except OSError:
+            same_dev = False
+
+        # bron, datum en doel bepalen gebeurt hier; alleen het kopiëren gaat naar de pool
+        tasks = self._resolve(batches, base_dir, out_dir, listings)
+        copies = self._copy_all(tasks, _link_or_copy if same_dev else _fast_copy)
+        try:
+            for target, err in copies:
+                self.done += 1
+                if err is None:
+                    self.ok += 1
+                    # OK-regels hooguit ~500 keer
+                    if self.done % max(1, self.total // 500) == 0 or self.done == self.total or self.done == 1:
+                        self.ui_q.put(("progress", self.done, "ok", target))
+                else:
+                    self.fail += 1
+                    self.ui_q.put(("progress", self.done, "error", err))
+        except (ScanError, EOFError) as e:
+            # uit _recv_batches: het scanproces faalde of stopte
+            self.ui_q.put(("error", f"Kon HTML niet lezen:\n{e}"))
             return
-
-        self.ui_q.put(("meta", len(items)))
-        base_dir = self.html_path.parent
-
-        ok = 0
-        fail = 0
-        for i, it in enumerate(items, 1):
-            if self.cancel.is_set():
-                self.ui_q.put(("log", f"Geannuleerd. Gelukt: {ok}, Mislukt: {fail}"))
-                return
-
-            raw_src = it.get("src") or ""
-            rel = normalize_src(raw_src)
-            src_path = (base_dir / rel).resolve()
-
-            # Als pad niet bestaat, probeer alleen de bestandsnaam in dezelfde map
-            if not src_path.exists():
-                alt = base_dir / Path(rel).name
-                if alt.exists():
-                    src_path = alt
-
-            if not src_path.exists():
-                fail += 1
-                self.ui_q.put(("progress", i, f"[{i}/{len(items)}] MISSEND: {raw_src}"))
-                continue
-
-            # datum bepalen
-            date_str = it.get("date") or date_from_name(src_path) or fallback_date_from_fs(src_path)
-            year = date_str[:4]
-            ym = date_str[:7]
-            tgt_dir = self.out_dir / year / ym
-            tgt_dir.mkdir(parents=True, exist_ok=True)
-
-            base_name = f"{date_str}_{src_path.name}"
-            target = tgt_dir / base_name
-
-            sfx = 1
-            while target.exists():
-                target = tgt_dir / f"{Path(base_name).stem}_{sfx}{Path(base_name).suffix}"
-                sfx += 1
-
-            try:
-                shutil.copy2(src_path, target)
-                ok += 1
-                self.ui_q.put(("progress", i, f"[{i}/{len(items)}] OK → {target.name}"))
-            except Exception as e:
-                fail += 1
-                self.ui_q.put(("progress", i, f"[{i}/{len(items)}] FOUT: {e}"))
-
-        self.ui_q.put(("done", f"Klaar. Gelukt: {ok}, Mislukt: {fail}\nUitvoer: {self.out_dir}"))
+        except Exception as e:
+            # bv. een doelmap die niet aangemaakt of gelezen kan worden
+            self.ui_q.put(("error", f"Gestopt tijdens het ordenen:\n{e}"))
+            return
+        finally:
+            copies.close()
+            tasks.close()
+            batches.close()
+
+        if self.cancel.is_set():
+            self.ui_q.put(("log", f"Geannuleerd. Gelukt: {self.ok}, Mislukt: {self.fail}"))
+        elif not self.total:
+            self.ui_q.put(("error", "Geen media-tags (img/video) gevonden in deze HTML."))
+        else:
+            self.ui_q.put(("done", f"Klaar. Gelukt: {self.ok}, Dubbel overgeslagen: {self.skipped}, Mislukt: {self.fail}\nUitvoer: {self.out_dir}"))
 
 # ---------------- GUI ----------------
+# voortgang komt binnen als ("progress", i, status, detail); alleen regels
+# die echt in het log komen worden opgemaakt
+PROGRESS_FMT = {
+    "ok": lambda d: f"OK → {os.path.basename(d)}",
+    "missing": lambda d: f"MISSEND: {d}",
+    "duplicate": lambda d: f"OVERGESLAGEN (dubbel): {d[1]}" + (f" (zelfde als {d[0]})" if d[0] != d[1] else ""),
+    "error": lambda d: f"FOUT: {d}",
+}
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -163,6 +393,8 @@ class App(tk.Tk):
         self.cancel_flag = threading.Event()
         self.ui_q = queue.Queue()
         self.worker = None
+        self.total = 0
+        self.log_lines = deque(maxlen=LOG_LINES)
 
         self._build_ui()
         self.after(100, self._pump)
@@ -200,7 +432,7 @@ class App(tk.Tk):
         ttk.Label(frm, textvariable=self.status_var).grid(row=6, column=0, sticky="w")
 
         ttk.Label(frm, text="Log:").grid(row=7, column=0, sticky="w", pady=(8,2))
-        self.txt = tk.Text(frm, height=12, wrap="word"); self.txt.grid(row=8, column=0, sticky="we")
+        self.txt = tk.Text(frm, height=12, wrap="word", state="disabled"); self.txt.grid(row=8, column=0, sticky="we")
         frm.columnconfigure(0, weight=1)
 
         rowb = ttk.Frame(self); rowb.pack(fill="x", padx=pad, pady=(0,pad))
@@ -219,7 +451,7 @@ class App(tk.Tk):
         self.cancel_flag.clear()
         self.worker = Worker(Path(html), Path(out), self.ui_q, self.cancel_flag)
         self.btn_start.configure(state="disabled"); self.btn_cancel.configure(state="normal")
-        self.txt.delete("1.0","end"); self.status_var.set("Bezig...")
+        self.log_lines.clear(); self._redraw_log(); self.status_var.set("Bezig...")
         self.pb.configure(value=0, maximum=1)
         self.worker.start()
 
@@ -228,33 +460,51 @@ class App(tk.Tk):
             self.cancel_flag.set()
             self.status_var.set("Annuleren...")
 
+    def _redraw_log(self):
+        # (begrensd) log in één keer herschrijven; tussendoor disabled, zodat er niet in getypt kan worden
+        self.txt.configure(state="normal")
+        self.txt.replace("1.0", "end", "\n".join(self.log_lines))
+        self.txt.configure(state="disabled")
+        self.txt.see("end")
+
     def _pump(self):
+        # berichten in één batch ophalen, daarna de widgets één keer bijwerken
+        lines = []
+        idx = status = None
+        drained = False
         try:
-            while True:
+            for _ in range(PUMP_BATCH):
                 msg = self.ui_q.get_nowait()
                 kind = msg[0]
                 if kind == "meta":
-                    total = msg[1]; self.pb.configure(value=0, maximum=max(total,1))
+                    # totaal groeit zolang het scanproces nog items stuurt
+                    self.total = msg[1]; self.pb.configure(maximum=max(self.total,1))
                 elif kind == "progress":
-                    idx, line = msg[1], msg[2]
-                    self.pb.configure(value=idx); self.status_var.set(line)
-                    self.txt.insert("end", line + "\n"); self.txt.see("end")
+                    idx = msg[1]
+                    status = f"[{idx}/{self.total}] " + PROGRESS_FMT[msg[2]](msg[3])
+                    lines.append(status)
                 elif kind == "log":
-                    line = msg[1]
-                    self.txt.insert("end", line + "\n"); self.txt.see("end")
+                    lines.append(msg[1])
                 elif kind == "done":
-                    line = msg[1]; self.status_var.set("Klaar")
-                    self.txt.insert("end", line + "\n"); self.txt.see("end")
+                    lines.append(msg[1]); status = None; self.status_var.set("Klaar")
                     self.btn_start.configure(state="normal"); self.btn_cancel.configure(state="disabled")
                 elif kind == "error":
                     line = msg[1]; messagebox.showerror("Fout", line)
-                    self.txt.insert("end", "FOUT: " + line + "\n"); self.txt.see("end")
+                    lines.append("FOUT: " + line); status = None; self.status_var.set("Fout.")
                     self.btn_start.configure(state="normal"); self.btn_cancel.configure(state="disabled")
-                    self.status_var.set("Fout.")
                 self.ui_q.task_done()
         except queue.Empty:
-            pass
-        self.after(100, self._pump)
+            drained = True
+        if idx is not None:
+            self.pb.configure(value=idx)
+        if status is not None:
+            self.status_var.set(status)
+        if lines:
+            self.log_lines.extend(lines)
+            self._redraw_log()
+        # limiet bereikt, er staat dus meer klaar: meteen verder, niet pas na 100 ms
+        self.after(100 if drained else 0, self._pump)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     App().mainloop()
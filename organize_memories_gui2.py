@@ -4,124 +4,270 @@ Organize Snapchat Memories (HTML export) — GUI with progress bar & cancel
 - Reads 'memories.html' (with <img>/<video> referencing local files)
 - Extracts the date (from HTML <div class="text-line">, filename, or file timestamp)
 - Copies files into folders: OUT/ YYYY / YYYY-MM / YYYY-MM-DD_<original>
-- Uses only Python standard libraries (tkinter, html.parser, shutil, etc.)
+- Uses only Python standard libraries (tkinter, re, shutil, etc.)
 """
 
-import re, shutil, threading, queue
+import calendar, codecs, multiprocessing, os, re, shutil, sys, threading, time, queue
+from collections import deque
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from pathlib import Path
-from html.parser import HTMLParser
+from html import unescape
 from datetime import datetime
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-# Multiple date patterns for different export formats
-DATE_PATTERNS = [
-    r"\b\d{4}-\d{2}-\d{2}\b",  # YYYY-MM-DD
-    r"\b\d{2}-\d{2}-\d{4}\b",  # MM-DD-YYYY
-    r"\b\d{4}_\d{2}_\d{2}\b",  # YYYY_MM_DD
-    r"\b\d{8}\b",              # YYYYMMDD
-    r"\b\d{6}\b",              # YYMMDD or MMDDYY
-]
-
-# ---------------- HTML parser ----------------
-class MemoriesHTML(HTMLParser):
-    """Collects (src, date) pairs from the HTML file."""
-    def __init__(self):
-        super().__init__()
-        self.items = []
-        self._in_textline = False
-        self._last_media_index = None
-
-    def handle_starttag(self, tag, attrs):
-        tag = tag.lower()
-        attrs = dict(attrs)
-        if tag in ("img", "video"):
-            src = attrs.get("src") or ""
-            if src:
-                self.items.append({"src": src, "date": ""})
-                self._last_media_index = len(self.items) - 1
-        elif tag == "div":
-            if "class" in attrs and "text-line" in attrs["class"]:
-                self._in_textline = True
-
-    def handle_endtag(self, tag):
-        if tag.lower() == "div":
-            self._in_textline = False
-
-    def handle_data(self, data):
-        if self._in_textline and self._last_media_index is not None:
-            # Try all date patterns
-            for pattern in DATE_PATTERNS:
-                m = re.search(pattern, data)
-                if m:
-                    date_str = m.group(0)
-                    # Normalize date to YYYY-MM-DD if needed
-                    try:
-                        if "_" in date_str:
-                            date_str = date_str.replace("_", "-")
-                        elif len(date_str) == 8 and "-" not in date_str:  # YYYYMMDD
-                            date_str = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-                        elif len(date_str) == 6:  # YYMMDD or MMDDYY
-                            # Try both formats
-                            try:
-                                dt = datetime.strptime(date_str, "%y%m%d")
-                            except ValueError:
-                                dt = datetime.strptime(date_str, "%m%d%y")
-                            date_str = dt.strftime("%Y-%m-%d")
-                        elif re.match(r"\d{2}-\d{2}-\d{4}", date_str):  # MM-DD-YYYY
-                            dt = datetime.strptime(date_str, "%m-%d-%Y")
-                            date_str = dt.strftime("%Y-%m-%d")
-                        
-                        # Validate the date
-                        datetime.strptime(date_str, "%Y-%m-%d")
-                        self.items[self._last_media_index]["date"] = date_str
-                        break
-                    except ValueError:
-                        continue
+# Date formats of the different export versions, fused into one pattern;
+# the name of the matching group tells how to normalize it, its number
+# the priority
+DATE_RE = re.compile(
+    r"\b(?:(?P<ymd>\d{4}-\d{2}-\d{2})"  # YYYY-MM-DD
+    r"|(?P<mdy>\d{2}-\d{2}-\d{4})"      # MM-DD-YYYY
+    r"|(?P<ymd_us>\d{4}_\d{2}_\d{2})"   # YYYY_MM_DD
+    r"|(?P<ymd8>\d{8})"                 # YYYYMMDD
+    r"|(?P<ymd6>\d{6}))\b"              # YYMMDD or MMDDYY
+)
+
+# Copies are I/O-bound, so several can be in flight at once
+COPY_WORKERS = 8
+MAX_IN_FLIGHT = 64  # queued copies; bounds memory on very large exports
+PUMP_BATCH = 256  # max UI messages handled per GUI tick
+LOG_LINES = 2000  # the log window keeps only the most recent lines
+
+# ---------------- HTML scan ----------------
+# Matches either a media tag (groups 1-3: src, double/single/un-quoted) or a
+# text-line div (group 4: its content, which may hold inline tags)
+MEDIA_RE = re.compile(
+    r"""<(?:img|video)\b[^>]*?\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>][^\s>]*)(?=[\s>]))"""
+    r"""|<div\b[^>]*?\sclass\s*=\s*(?:"[^"]*text-line[^"]*"|'[^']*text-line[^']*'|[^\s"'>]*text-line[^\s>]*)"""
+    r"""[^>]*>((?:[^<]|<(?!/?div\b))*)</div>""",
+    re.I,
+)
+TAG_RE = re.compile(r"<[^>]*>")
+
+READ_CHUNK = 1 << 20  # the HTML is read in 1 MiB blocks
+SCAN_TAIL = 4096  # carried over between blocks so a tag split across reads is still found
+SCAN_BATCH = 1000  # items per message from the scan process
+
+def decode_chunks(f, size: int = READ_CHUNK):
+    """Decodes a binary file block by block: UTF-8 (BOM optional), else cp1252."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        raw = f.read(size)
+        try:
+            text = decoder.decode(raw, final=not raw)
+        except UnicodeDecodeError as e:
+            # Not UTF-8 after all. What came before the first invalid byte was
+            # valid UTF-8 and stays as decoded; from that byte on, read cp1252.
+            # (e.object is this block plus any bytes held over from the last.)
+            decoder = codecs.getincrementaldecoder("cp1252")(errors="replace")
+            text = (e.object[:e.start].decode("utf-8")
+                    + decoder.decode(e.object[e.start:], final=not raw))
+        if text:
+            yield text
+        if not raw:
+            break
+
+def iter_memories(chunks):
+    """Yields (src, date) pairs while scanning the HTML block by block."""
+    src, date = None, ""
+    buf = ""
+    for chunk in chunks:
+        buf += chunk
+        end = 0
+        for m in MEDIA_RE.finditer(buf):
+            end = m.end()
+            if m.lastindex < 4:
+                if not m.group(m.lastindex):
+                    continue  # empty src
+                if src is not None:
+                    yield src, date
+                src, date = unescape(m.group(m.lastindex)), ""
+            elif src is not None and not date:
+                date = date_from_text(TAG_RE.sub(" ", m.group(4)))
+        buf = buf[max(end, len(buf) - SCAN_TAIL):]
+    if src is not None:
+        yield src, date
 
 # ---------------- helpers ----------------
-def normalize_src(src: str) -> str:
-    s = src.strip()
-    if s.startswith(".//"):
-        s = s[3:]
-    elif s.startswith("./"):
-        s = s[2:]
-    return s.split("?", 1)[0]
-
-def date_from_name(path: Path) -> str:
-    for pattern in DATE_PATTERNS:
-        m = re.search(pattern, path.name)
-        if m:
-            date_str = m.group(0)
-            # Normalize date to YYYY-MM-DD if needed
-            try:
-                if "_" in date_str:
-                    date_str = date_str.replace("_", "-")
-                elif len(date_str) == 8 and "-" not in date_str:  # YYYYMMDD
-                    date_str = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-                elif len(date_str) == 6:  # YYMMDD or MMDDYY
-                    # Try both formats
-                    try:
-                        dt = datetime.strptime(date_str, "%y%m%d")
-                    except ValueError:
-                        dt = datetime.strptime(date_str, "%m%d%y")
-                    date_str = dt.strftime("%Y-%m-%d")
-                elif re.match(r"\d{2}-\d{2}-\d{4}", date_str):  # MM-DD-YYYY
-                    dt = datetime.strptime(date_str, "%m-%d-%Y")
-                    date_str = dt.strftime("%Y-%m-%d")
-                
-                # Validate the date
-                datetime.strptime(date_str, "%Y-%m-%d")
-                return date_str
-            except ValueError:
-                continue
+def normalize_srcs(srcs) -> list:
+    # in one pass: strip whitespace, a leading "./" or ".//" and any query string
+    return [
+        (s[3:] if s.startswith(".//") else s[2:] if s.startswith("./") else s).partition("?")[0]
+        for s in map(str.strip, srcs)
+    ]
+
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _is_iso_date(s: str) -> bool:
+    """True if s is a valid YYYY-MM-DD date; a fixed-layout check instead of strptime."""
+    if not (len(s) == 10 and s[4] == s[7] == "-" and s.isascii()
+            and s[:4].isdigit() and s[5:7].isdigit() and s[8:].isdigit()):
+        return False
+    y, m, d = int(s[:4]), int(s[5:7]), int(s[8:])
+    if y < 1 or not 1 <= m <= 12 or d < 1:
+        return False
+    if m == 2 and d == 29:
+        return calendar.isleap(y)
+    return d <= _DAYS_IN_MONTH[m - 1]
+
+def _from_6_digits(s: str) -> str:
+    # YYMMDD or MMDDYY, try both formats
+    try:
+        dt = datetime.strptime(s, "%y%m%d")
+    except ValueError:
+        dt = datetime.strptime(s, "%m%d%y")
+    return dt.strftime("%Y-%m-%d")
+
+# Normalize a DATE_RE match to YYYY-MM-DD, keyed by group name
+_DATE_NORMALIZERS = {
+    "ymd": lambda s: s,
+    "mdy": lambda s: f"{s[6:]}-{s[:2]}-{s[3:5]}",
+    "ymd_us": lambda s: s.replace("_", "-"),
+    "ymd8": lambda s: f"{s[:4]}-{s[4:6]}-{s[6:8]}",
+    "ymd6": _from_6_digits,
+}
+
+@lru_cache(maxsize=4096)
+def _normalize_date(kind: str, raw: str) -> str:
+    try:
+        date_str = _DATE_NORMALIZERS[kind](raw)
+    except ValueError:
+        return ""
+    # Validate the date
+    return date_str if _is_iso_date(date_str) else ""
+
+def date_from_text(text: str) -> str:
+    # As with one search per format: the first match of each format counts,
+    # and formats are tried in priority order, not in order of position
+    first = {}
+    for m in DATE_RE.finditer(text):
+        first.setdefault(m.lastindex, m)
+    for _, m in sorted(first.items()):
+        date_str = _normalize_date(m.lastgroup, m.group(0))
+        if date_str:
+            return date_str
     return ""
 
-def fallback_date_from_fs(path: Path) -> str:
-    dt = datetime.fromtimestamp(path.stat().st_mtime)
-    return dt.strftime("%Y-%m-%d")
+def date_from_name(name: str) -> str:
+    return date_from_text(name)
+
+def dir_files(listings: dict, folder: str) -> dict:
+    """
+    The files in `folder` as {normcase(name): DirEntry}. Each folder is read with
+    os.scandir once, the first time a src points into it, and kept in `listings`.
+    """
+    files = listings.get(folder)
+    if files is None:
+        try:
+            with os.scandir(folder) as it:
+                files = {os.path.normcase(e.name): e for e in it if e.is_file()}
+        except OSError:
+            files = {}  # missing or unreadable folder
+        listings[folder] = files
+    return files
+
+def _outside(rel: str) -> bool:
+    # absolute (also "\\x" or "C:..." on Windows) or going up out of the export folder
+    return (os.path.isabs(rel) or bool(os.path.splitdrive(rel)[0]) or rel.startswith(os.sep)
+            or rel == os.pardir or rel.startswith(os.pardir + os.sep))
+
+def _find_in(listings: dict, folder: str, name: str):
+    """Looks `name` up in the listing of `folder`; returns (path, DirEntry), (path, None) or (None, None)."""
+    entry = dir_files(listings, folder).get(os.path.normcase(name))
+    if entry is not None:
+        return entry.path, entry
+    # not listed under this spelling; normcase only ignores case on Windows, but
+    # macOS does too by default, so ask the filesystem once
+    path = os.path.join(folder, name)
+    return (path, None) if os.path.isfile(path) else (None, None)
+
+def find_source(base_dir: str, listings: dict, rel: str):
+    """
+    Resolves a normalized src in base_dir. Returns (path, DirEntry), (path, None)
+    outside the export folder or after a listing miss, or (None, None) if not found.
+    """
+    rel = os.path.normpath(rel)
+    if _outside(rel):
+        # only checked on disk: folders outside the export are not listed
+        path = os.path.join(base_dir, rel)
+        if os.path.exists(path):
+            return path, None
+    else:
+        folder, name = os.path.split(rel)
+        path, entry = _find_in(listings, os.path.join(base_dir, folder) if folder else base_dir, name)
+        if path is not None:
+            return path, entry
+    # fallback: try basename only
+    return _find_in(listings, base_dir, os.path.basename(rel))
+
+def fallback_date_from_fs(path: str, entry=None) -> str:
+    # mtime from the DirEntry's cached stat when we have one; formatted by hand (strftime is slow)
+    st = entry.stat() if entry is not None else os.stat(path)
+    t = time.localtime(st.st_mtime)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+    # use_last_error: keep the error code right after the call, before anything overwrites it
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CopyFileW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.BOOL)
+    _kernel32.CopyFileW.restype = wintypes.BOOL
+
+def _fast_copy(src: str, dst: str):
+    """
+    shutil.copy2, except on Windows, where CopyFileW lets the OS copy the file.
+    Never overwrites: if dst already exists (e.g. a name that only differs in case
+    on a case-insensitive disk), this raises instead.
+    """
+    if sys.platform == "win32":
+        if not _kernel32.CopyFileW(src, dst, True):  # fail if dst exists
+            raise ctypes.WinError(ctypes.get_last_error())
+        return  # CopyFileW also copies timestamps and attributes
+    # claim the name first; O_EXCL fails if the file system already has it
+    os.close(os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+    try:
+        # copy2 already uses sendfile on Linux and fcopyfile on macOS
+        shutil.copy2(src, dst)
+    except OSError:
+        with suppress(OSError):
+            os.remove(dst)
+        raise
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlinks dst to src (same filesystem: no bytes copied, no extra space); copies if that fails."""
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        raise
+    except OSError:
+        # e.g. no hardlink support, no permission, link limit reached
+        _fast_copy(src, dst)
 
 # ---------------- worker thread ----------------
+def _scan_process(html_path: str, conn):
+    """Child process: scans the HTML and sends ("items", [(src, date), ...]) batches."""
+    try:
+        batch = []
+        # Decode in one pass: UTF-8 if it is valid, otherwise cp1252
+        with open(html_path, "rb") as f:
+            for item in iter_memories(decode_chunks(f)):
+                batch.append(item)
+                if len(batch) >= SCAN_BATCH:
+                    conn.send(("items", batch))
+                    batch = []
+        conn.send(("items", batch))
+        conn.send(("end", None))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+class ScanError(Exception):
+    """An error reported by the scan process."""
+
 class Worker(threading.Thread):
     def __init__(self, html_path: Path, out_dir: Path, ui_q: "queue.Queue", cancel_flag: threading.Event):
         super().__init__(daemon=True)
@@ -129,103 +275,196 @@ class Worker(threading.Thread):
         self.out_dir = out_dir
         self.ui_q = ui_q
         self.cancel = cancel_flag
+        self._dir_names = {}  # output folder -> casefolded names in it (existing + queued)
+        # casefold on every platform: normcase keeps case on macOS, but APFS ignores it
+        # by default; an extra _1 on a case-sensitive disk costs nothing
         self.last_update = 0
+        # Counters, updated as scan batches and finished copies come in
+        self.total = self.done = 0
+        self.ok = self.fail = self.skipped = 0
+
+    def _start_scan(self):
+        """Starts scanning the HTML in a child process; returns a generator of batches."""
+        ctx = multiprocessing.get_context("spawn")
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_scan_process, args=(str(self.html_path), send_conn), daemon=True)
+        proc.start()
+        send_conn.close()
+        return self._recv_batches(proc, recv_conn)
+
+    @staticmethod
+    def _recv_batches(proc, conn):
+        try:
+            while True:
+                kind, payload = conn.recv()
+                if kind == "items":
+                    yield payload
+                elif kind == "error":
+                    raise ScanError(payload)
+                else:
+                    return
+        finally:
+            conn.close()
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+    def _should_report(self) -> bool:
+        # Throttle UI updates to at most ~500 per run
+        return self.done % max(1, self.total // 500) == 0 or self.done == self.total or self.done == 1
+
+    def _resolve(self, batches, base_dir: str, out_dir: str, listings: dict):
+        """Turns scanned (src, date) batches into (src, target) copy tasks; reports misses and duplicates."""
+        seen = {}  # (source, date) -> src of its first reference
+        for batch in batches:
+            self.total += len(batch)
+            self.ui_q.put(("meta", self.total))
+            rels = normalize_srcs([src for src, _ in batch])
+            for (raw_src, html_date), rel in zip(batch, rels):
+                if self.cancel.is_set():
+                    return
+
+                src_path, entry = find_source(base_dir, listings, rel)
+                if src_path is None:
+                    self.fail += 1
+                    self.done += 1
+                    if self._should_report():
+                        self.ui_q.put(("progress", self.done, "missing", raw_src))
+                    continue
+
+                # determine date
+                src_name = os.path.basename(src_path)
+                date_str = html_date or date_from_name(src_name) or fallback_date_from_fs(src_path, entry)
+                
+                # Validate date format
+                if not _is_iso_date(date_str):
+                    # Invalid date format, use fallback
+                    date_str = fallback_date_from_fs(src_path, entry)
+                
+                # The export often references the same media more than once
+                key = (os.path.normcase(src_path), date_str)
+                if key in seen:
+                    self.skipped += 1
+                    self.done += 1
+                    if self._should_report():
+                        self.ui_q.put(("progress", self.done, "duplicate", (seen[key], raw_src)))
+                    continue
+                seen[key] = raw_src
+
+                year = date_str[:4]
+                ym = date_str[:7]
+                tgt_dir = os.path.join(out_dir, year, ym)
+                names = self._dir_names.get(tgt_dir)
+                if names is None:
+                    os.makedirs(tgt_dir, exist_ok=True)
+                    names = {e.name.casefold() for e in os.scandir(tgt_dir)}
+                    self._dir_names[tgt_dir] = names
+
+                base_name = f"{date_str}_{src_name}"
+                name = base_name
+
+                stem, suffix = os.path.splitext(base_name)
+                sfx = 1
+                while name.casefold() in names:
+                    name = f"{stem}_{sfx}{suffix}"
+                    sfx += 1
+                names.add(name.casefold())
+                yield src_path, os.path.join(tgt_dir, name)
+
+    def _copy_all(self, tasks, copy=_fast_copy):
+        """
+        Copies (src, target) pairs in the pool, yielding (target, error or None) as they finish.
+        On cancel, copies that haven't started are dropped; running ones are still yielded.
+        """
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            pending = {}
+            try:
+                for src, target in tasks:
+                    if len(pending) >= MAX_IN_FLIGHT:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            yield pending.pop(fut), fut.exception()
+                    if self.cancel.is_set():
+                        break  # cancelled: start nothing new
+                    pending[pool.submit(copy, src, target)] = target
+                if self.cancel.is_set():
+                    # drop the copies that haven't started; the rest land on disk, so count them
+                    pending = {fut: target for fut, target in pending.items() if not fut.cancel()}
+                for fut in as_completed(pending):
+                    yield pending[fut], fut.exception()
+            finally:
+                # closed early (error): drop the copies that haven't started
+                for fut in pending:
+                    fut.cancel()
 
     def run(self):
-        # Try multiple encodings for the HTML file
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-        text = None
-        
-        for encoding in encodings:
-            try:
-                text = self.html_path.read_text(encoding=encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                self.ui_q.put(("error", f"Could not read HTML file with {encoding}:\n{e}"))
-                return
-        
-        if text is None:
-            self.ui_q.put(("error", "Could not read HTML file with any supported encoding."))
+        # The HTML is scanned in a child process (no GIL contention), and copying
+        # starts as soon as the first batch of items arrives
+        try:
+            batches = self._start_scan()
+        except Exception as e:
+            self.ui_q.put(("error", f"Could not read HTML file:\n{e}"))
             return
 
-        parser = MemoriesHTML()
-        parser.feed(text)
-        items = parser.items
-
-        if not items:
-            self.ui_q.put(("error", "No media entries found in this HTML file."))
+        # plain strings in the loop below: Path objects cost several allocations per item
+        base_dir = str(self.html_path.parent)
+        out_dir = str(self.out_dir)
+        # folders of the export, each listed once when first needed, instead of exists() calls per item
+        listings = {}
+        # same filesystem: hardlink instead of copying the bytes
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            same_dev = os.stat(base_dir).st_dev == os.stat(out_dir).st_dev
+        except OSError:
+            same_dev = False
+
+        # Sources, dates and targets are resolved here; only the copies run in the pool
+        tasks = self._resolve(batches, base_dir, out_dir, listings)
+        copies = self._copy_all(tasks, _link_or_copy if same_dev else _fast_copy)
+        try:
+            for target, err in copies:
+                self.done += 1
+                if err is None:
+                    self.ok += 1
+                    if self._should_report():
+                        self.ui_q.put(("progress", self.done, "ok", target))
+                elif isinstance(err, IOError):
+                    self.fail += 1
+                    self.ui_q.put(("progress", self.done, "ioerror", err))
+                else:
+                    self.fail += 1
+                    self.ui_q.put(("progress", self.done, "error", err))
+        except (ScanError, EOFError) as e:
+            # raised by _recv_batches: the scan process failed or died
+            self.ui_q.put(("error", f"Could not read HTML file:\n{e}"))
             return
-
-        self.ui_q.put(("meta", len(items)))
-        base_dir = self.html_path.parent
-        ok = fail = 0
-        
-        # Calculate update interval to throttle UI updates
-        update_interval = max(1, len(items) // 100)  # Update at most 100 times
-
-        for i, it in enumerate(items, 1):
-            if self.cancel.is_set():
-                self.ui_q.put(("log", f"Cancelled. Success: {ok}, Failed: {fail}"))
-                return
-
-            raw_src = it.get("src") or ""
-            rel = normalize_src(raw_src)
-            src_path = (base_dir / rel).resolve()
-
-            # fallback: try basename only
-            if not src_path.exists():
-                alt = base_dir / Path(rel).name
-                if alt.exists():
-                    src_path = alt
-
-            if not src_path.exists():
-                fail += 1
-                # Throttle UI updates for missing files
-                if i % update_interval == 0 or i == len(items) or i == 1:
-                    self.ui_q.put(("progress", i, f"[{i}/{len(items)}] MISSING: {raw_src}"))
-                continue
-
-            # determine date
-            date_str = it.get("date") or date_from_name(src_path) or fallback_date_from_fs(src_path)
-            
-            # Validate date format
-            try:
-                datetime.strptime(date_str, "%Y-%m-%d")
-            except ValueError:
-                # Invalid date format, use fallback
-                date_str = fallback_date_from_fs(src_path)
-            
-            year = date_str[:4]
-            ym = date_str[:7]
-            tgt_dir = self.out_dir / year / ym
-            tgt_dir.mkdir(parents=True, exist_ok=True)
-
-            base_name = f"{date_str}_{src_path.name}"
-            target = tgt_dir / base_name
-
-            sfx = 1
-            while target.exists():
-                target = tgt_dir / f"{Path(base_name).stem}_{sfx}{Path(base_name).suffix}"
-                sfx += 1
-
-            try:
-                shutil.copy2(src_path, target)
-                ok += 1
-                # Throttle UI updates
-                if i % update_interval == 0 or i == len(items) or i == 1:
-                    self.ui_q.put(("progress", i, f"[{i}/{len(items)}] OK → {target.name}"))
-            except IOError as e:
-                fail += 1
-                self.ui_q.put(("progress", i, f"[{i}/{len(items)}] IO ERROR: {e}"))
-            except Exception as e:
-                fail += 1
-                self.ui_q.put(("progress", i, f"[{i}/{len(items)}] ERROR: {e}"))
-
-        self.ui_q.put(("done", f"Finished. Success: {ok}, Failed: {fail}\nOutput: {self.out_dir}"))
+        except Exception as e:
+            # e.g. a target folder that can't be created or listed
+            self.ui_q.put(("error", f"Stopped while organizing the files:\n{e}"))
+            return
+        finally:
+            copies.close()
+            tasks.close()
+            batches.close()
+
+        if self.cancel.is_set():
+            self.ui_q.put(("log", f"Cancelled. Success: {self.ok}, Failed: {self.fail}"))
+        elif not self.total:
+            self.ui_q.put(("error", "No media entries found in this HTML file."))
+        else:
+            self.ui_q.put(("done", f"Finished. Success: {self.ok}, Duplicates skipped: {self.skipped}, Failed: {self.fail}\nOutput: {self.out_dir}"))
 
 # ---------------- GUI ----------------
+# Worker progress is sent as ("progress", i, status, detail); only lines that
+# reach the log are formatted
+PROGRESS_FMT = {
+    "ok": lambda d: f"OK → {os.path.basename(d)}",
+    "missing": lambda d: f"MISSING: {d}",
+    "duplicate": lambda d: f"SKIP duplicate: {d[1]}" + (f" (same as {d[0]})" if d[0] != d[1] else ""),
+    "ioerror": lambda d: f"IO ERROR: {d}",
+    "error": lambda d: f"ERROR: {d}",
+}
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -240,6 +479,8 @@ class App(tk.Tk):
         self.cancel_flag = threading.Event()
         self.ui_q = queue.Queue()
         self.worker = None
+        self.total = 0
+        self.log_lines = deque(maxlen=LOG_LINES)
 
         self._build_ui()
         self.after(100, self._pump)
@@ -275,7 +516,7 @@ class App(tk.Tk):
         ttk.Label(frm, textvariable=self.status_var).grid(row=6, column=0, sticky="w")
 
         ttk.Label(frm, text="Log:").grid(row=7, column=0, sticky="w", pady=(8,2))
-        self.txt = tk.Text(frm, height=12, wrap="word"); self.txt.grid(row=8, column=0, sticky="we")
+        self.txt = tk.Text(frm, height=12, wrap="word", state="disabled"); self.txt.grid(row=8, column=0, sticky="we")
         frm.columnconfigure(0, weight=1)
 
         rowb = ttk.Frame(self); rowb.pack(fill="x", padx=pad, pady=(0,pad))
@@ -295,7 +536,8 @@ class App(tk.Tk):
         self.worker = Worker(Path(html), Path(out), self.ui_q, self.cancel_flag)
         self.btn_start.configure(state="disabled")
         self.btn_cancel.configure(state="normal")
-        self.txt.delete("1.0","end")
+        self.log_lines.clear()
+        self._redraw_log()
         self.status_var.set("Working...")
         self.pb.configure(value=0, maximum=1)
         self.worker.start()
@@ -305,39 +547,59 @@ class App(tk.Tk):
             self.cancel_flag.set()
             self.status_var.set("Cancelling...")
 
+    def _redraw_log(self):
+        # Rewrite the (bounded) log in one go; kept disabled in between so it can't be typed into
+        self.txt.configure(state="normal")
+        self.txt.replace("1.0", "end", "\n".join(self.log_lines))
+        self.txt.configure(state="disabled")
+        self.txt.see("end")
+
     def _pump(self):
+        # Drain a batch of messages, then update each widget once
+        lines = []
+        idx = status = None
+        drained = False
         try:
-            while True:
+            for _ in range(PUMP_BATCH):
                 msg = self.ui_q.get_nowait()
                 kind = msg[0]
                 if kind == "meta":
-                    total = msg[1]
-                    self.pb.configure(value=0, maximum=max(total, 1))
+                    # total grows while the scan process is still sending items
+                    self.total = msg[1]
+                    self.pb.configure(maximum=max(self.total, 1))
                 elif kind == "progress":
-                    idx, line = msg[1], msg[2]
-                    self.pb.configure(value=idx)
-                    self.status_var.set(line)
-                    self.txt.insert("end", line + "\n"); self.txt.see("end")
+                    idx = msg[1]
+                    status = f"[{idx}/{self.total}] " + PROGRESS_FMT[msg[2]](msg[3])
+                    lines.append(status)
                 elif kind == "log":
-                    line = msg[1]
-                    self.txt.insert("end", line + "\n"); self.txt.see("end")
+                    lines.append(msg[1])
                 elif kind == "done":
-                    line = msg[1]
+                    lines.append(msg[1])
+                    status = None
                     self.status_var.set("Done")
-                    self.txt.insert("end", line + "\n"); self.txt.see("end")
                     self.btn_start.configure(state="normal")
                     self.btn_cancel.configure(state="disabled")
                 elif kind == "error":
                     line = msg[1]
                     messagebox.showerror("Error", line)
-                    self.txt.insert("end", "ERROR: " + line + "\n")
+                    lines.append("ERROR: " + line)
+                    status = None
                     self.btn_start.configure(state="normal")
                     self.btn_cancel.configure(state="disabled")
                     self.status_var.set("Error.")
                 self.ui_q.task_done()
         except queue.Empty:
-            pass
-        self.after(100, self._pump)
+            drained = True
+        if idx is not None:
+            self.pb.configure(value=idx)
+        if status is not None:
+            self.status_var.set(status)
+        if lines:
+            self.log_lines.extend(lines)
+            self._redraw_log()
+        # cap reached, so more is waiting: come back right away, not in 100 ms
+        self.after(100 if drained else 0, self._pump)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     App().mainloop()
\ No newline at end of file